@@ -1,15 +1,100 @@
 """Bird.com WhatsApp API integration module."""
 
+import asyncio
+import json
+import logging
 import os
-from typing import Any
+from typing import Any, Iterable, Sequence
 
 import aiohttp
 
 from logger import logger
+from rate_limiter import RateLimiter
+
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    import httpx
+except ImportError:  # pragma: no cover - HTTP/2 support is optional
+    httpx = None
 
 
 BIRD_API_BASE_URL = "https://api.bird.com"
 
+# Pre-rendered "0".."31" keys for the template variables mapping
+_VARIABLE_KEYS = tuple(str(i) for i in range(32))
+
+# Log one aggregated progress line per this many recipients in send_many()
+BULK_PROGRESS_INTERVAL = 100
+
+# Stand-in for the recipient when pre-rendering a template message payload
+_RECIPIENT_PLACEHOLDER = "\x00recipient\x00"
+
+
+def _template_payload(
+    recipient_phone: str,
+    template_id: str,
+    template_language: str,
+    template_variables: Sequence[str],
+) -> dict[str, Any]:
+    """Build the JSON payload for one template message."""
+    # Bird keys template variables by their position as a string
+    keys = (
+        _VARIABLE_KEYS
+        if len(template_variables) <= len(_VARIABLE_KEYS)
+        else map(str, range(len(template_variables)))
+    )
+
+    return {
+        "receiver": {
+            "contacts": [
+                {
+                    "identifierValue": recipient_phone,
+                    "identifierKey": "phonenumber",
+                }
+            ]
+        },
+        "template": {
+            "projectId": template_id,
+            "version": "latest",
+            "locale": template_language,
+            "variables": dict(zip(keys, template_variables)),
+        },
+    }
+
+
+def _render_template_payload(
+    template_id: str,
+    template_language: str,
+    template_variables: Sequence[str],
+) -> tuple[bytes, bytes]:
+    """
+    Serialize a template message payload shared by many recipients, minus the recipient.
+
+    Returns:
+        ``(prefix, suffix)`` such that ``prefix + <JSON phone> + suffix`` is the
+        complete request body for one recipient.
+    """
+    payload = _template_payload(
+        _RECIPIENT_PLACEHOLDER, template_id, template_language, template_variables
+    )
+    # The receiver is serialized first, so the first match is the placeholder
+    prefix, _, suffix = _json_dumps(payload).partition(
+        _json_dumps(_RECIPIENT_PLACEHOLDER)
+    )
+    return prefix, suffix
+
 
 class BirdAPIError(Exception):
     """Raised when the Bird.com API returns an error response."""
@@ -28,6 +113,13 @@ class BirdAPIClient:
         BIRD_API_KEY       - API access key
         BIRD_WORKSPACE_ID  - Bird workspace identifier
         BIRD_CHANNEL_ID    - WhatsApp channel identifier
+        BIRD_POOL_PER_HOST - Max pooled connections to the Bird.com host (default 64)
+        BIRD_USE_HTTP2     - Set to 1 to multiplex requests over HTTP/2
+                             (requires httpx[http2]; falls back to aiohttp)
+
+    An existing aiohttp session can be passed as ``session``; the client then
+    sends through it (adding its auth headers per request) instead of creating
+    its own, and leaves closing it to the caller.
     """
 
     def __init__(
@@ -36,28 +128,105 @@ class BirdAPIClient:
         workspace_id: str | None = None,
         channel_id: str | None = None,
         base_url: str = BIRD_API_BASE_URL,
+        session: aiohttp.ClientSession | None = None,
     ) -> None:
         self.api_key = api_key or os.environ["BIRD_API_KEY"]
         self.workspace_id = workspace_id or os.environ["BIRD_WORKSPACE_ID"]
         self.channel_id = channel_id or os.environ["BIRD_CHANNEL_ID"]
         self.base_url = base_url.rstrip("/")
-        self._session: aiohttp.ClientSession | None = None
+        self._messages_url = (
+            f"{self.base_url}/workspaces/{self.workspace_id}"
+            f"/channels/{self.channel_id}/messages"
+        )
+        self._message_status_base = (
+            f"{self.base_url}/workspaces/{self.workspace_id}/messages/"
+        )
+        self._session: aiohttp.ClientSession | None = session
+        self._owns_session = session is None
+        # Sessions we create carry the auth headers; a borrowed one does not
+        self._request_headers = None if self._owns_session else self._headers()
+        self._http2_client: "httpx.AsyncClient | None" = None
+
+        self.use_http2 = os.getenv("BIRD_USE_HTTP2", "0") == "1"
+        if self.use_http2 and httpx is None:
+            logger.warning(
+                "BIRD_USE_HTTP2 is set but httpx[http2] is not installed; "
+                "falling back to aiohttp over HTTP/1.1"
+            )
+            self.use_http2 = False
+
+    def _headers(self) -> dict[str, str]:
+        """Return the headers sent with every Bird.com request."""
+        return {
+            "Authorization": f"AccessKey {self.api_key}",
+            "Content-Type": "application/json",
+        }
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Return (or create) the shared aiohttp session."""
+        if not self._owns_session:
+            return self._session
         if self._session is None or self._session.closed:
+            # All traffic goes to a single host, so size the pool per host and
+            # keep connections (and DNS results) around between sends.
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=int(os.getenv("BIRD_POOL_PER_HOST", "64")),
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            )
             self._session = aiohttp.ClientSession(
-                headers={
-                    "Authorization": f"AccessKey {self.api_key}",
-                    "Content-Type": "application/json",
-                }
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30, connect=5),
+                headers=self._headers(),
             )
         return self._session
 
+    def _get_http2_client(self) -> "httpx.AsyncClient":
+        """Return (or create) the shared HTTP/2 client."""
+        if self._http2_client is None or self._http2_client.is_closed:
+            pool_size = int(os.getenv("BIRD_POOL_PER_HOST", "64"))
+            self._http2_client = httpx.AsyncClient(
+                http2=True,
+                headers=self._headers(),
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=75,
+                ),
+                timeout=httpx.Timeout(30, connect=5),
+            )
+        return self._http2_client
+
+    async def _request(
+        self, method: str, url: str, body: bytes | None = None
+    ) -> tuple[int, Any]:
+        """Send a request over the configured transport; return (status, JSON body)."""
+        if self.use_http2:
+            client = self._get_http2_client()
+            response = await client.request(method, url, content=body)
+            raw = response.content
+            return response.status_code, _json_loads(raw) if raw.strip() else None
+
+        session = await self._get_session()
+        async with session.request(
+            method, url, data=body, headers=self._request_headers
+        ) as response:
+            return response.status, await self._read_json(response)
+
+    @staticmethod
+    async def _read_json(response: aiohttp.ClientResponse) -> Any:
+        """Decode a response body as JSON regardless of its content type."""
+        raw = await response.read()
+        return _json_loads(raw) if raw.strip() else None
+
     async def close(self) -> None:
-        """Close the underlying HTTP session."""
-        if self._session and not self._session.closed:
+        """Close the underlying HTTP session (unless it was passed in)."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
+        if self._http2_client and not self._http2_client.is_closed:
+            await self._http2_client.aclose()
 
     async def send_template_message(
         self,
@@ -81,66 +250,117 @@ class BirdAPIClient:
         Raises:
             BirdAPIError: If the API returns a non-2xx status code.
         """
-        session = await self._get_session()
+        body = _json_dumps(
+            _template_payload(
+                recipient_phone,
+                template_id,
+                template_language,
+                template_variables or (),
+            )
+        )
+        return await self._post_message(recipient_phone, template_id, body)
 
-        # Build template components
-        components: list[dict[str, Any]] = []
-        if template_variables:
-            parameters = [
-                {"type": "text", "text": v} for v in template_variables
-            ]
-            components.append({"type": "body", "parameters": parameters})
-
-        payload: dict[str, Any] = {
-            "receiver": {
-                "contacts": [
-                    {
-                        "identifierValue": recipient_phone,
-                        "identifierKey": "phonenumber",
-                    }
-                ]
-            },
-            "template": {
-                "projectId": template_id,
-                "version": "latest",
-                "locale": template_language,
-                "variables": {
-                    str(i): v
-                    for i, v in enumerate(template_variables or [])
-                },
-            },
-        }
+    async def send_many(
+        self,
+        recipients: Iterable[tuple[str, Sequence[str] | None]],
+        template_id: str,
+        template_language: str = "en",
+        template_variables: Sequence[str] | None = None,
+        concurrency: int = 16,
+        rate_limiter: RateLimiter | None = None,
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        Send a template message to many recipients concurrently.
 
-        url = (
-            f"{self.base_url}/workspaces/{self.workspace_id}"
-            f"/channels/{self.channel_id}/messages"
-        )
+        The payload for recipients using the shared ``template_variables`` is
+        serialized once, and only each phone number is spliced into it.
+        Recipients with their own variables get their payload serialized
+        directly, as it would never be reused.
 
-        logger.info(
-            "Sending WhatsApp template message to %s via Bird.com (template=%s)",
-            recipient_phone,
-            template_id,
+        Args:
+            recipients: ``(phone, template_variables)`` pairs; ``None`` variables
+                mean the shared ``template_variables`` are used.
+            template_id: Bird.com / WhatsApp template identifier.
+            template_language: ISO language code for the template (default 'en').
+            template_variables: Variables for every recipient without its own.
+            concurrency: Maximum number of requests in flight at once.
+            rate_limiter: Optional limiter acquired before every send.
+
+        Returns:
+            One entry per recipient, in order: the parsed JSON response on
+            success, or the exception that made that send fail.
+        """
+        recipients = list(recipients)
+        semaphore = asyncio.Semaphore(concurrency)
+        processed = 0
+        shared_prefix, shared_suffix = _render_template_payload(
+            template_id, template_language, template_variables or ()
         )
 
-        async with session.post(url, json=payload) as response:
-            body = await response.json(content_type=None)
+        def body_for(phone: str, variables: Sequence[str] | None) -> bytes:
+            if variables is None:
+                return shared_prefix + _json_dumps(phone) + shared_suffix
+            return _json_dumps(
+                _template_payload(phone, template_id, template_language, variables)
+            )
 
-            if response.status >= 400:
-                error_message = body.get("message", str(body))
-                logger.error(
-                    "Bird API error %d for %s: %s",
-                    response.status,
-                    recipient_phone,
-                    error_message,
-                )
-                raise BirdAPIError(response.status, error_message)
+        async def send_one(
+            phone: str, variables: Sequence[str] | None
+        ) -> dict[str, Any] | Exception:
+            nonlocal processed
+            async with semaphore:
+                try:
+                    if rate_limiter is not None:
+                        await rate_limiter.acquire()
+                    body = body_for(phone, variables)
+                    return await self._post_message(phone, template_id, body)
+                except BirdAPIError as exc:
+                    return exc
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("Unexpected error for %s", phone)
+                    return exc
+                finally:
+                    processed += 1
+                    if processed % BULK_PROGRESS_INTERVAL == 0:
+                        logger.info(
+                            "Bulk send progress: %d/%d recipients",
+                            processed,
+                            len(recipients),
+                        )
 
+        return await asyncio.gather(
+            *(send_one(phone, variables) for phone, variables in recipients)
+        )
+
+    async def _post_message(
+        self, recipient_phone: str, template_id: str, body: bytes
+    ) -> dict[str, Any]:
+        """POST a serialized message body; raise BirdAPIError on failure."""
+        if logger.isEnabledFor(logging.INFO):
             logger.info(
-                "Message sent successfully to %s, response status %d",
+                "Sending WhatsApp template message to %s via Bird.com (template=%s)",
                 recipient_phone,
-                response.status,
+                template_id,
             )
-            return body
+
+        status, response_body = await self._request("POST", self._messages_url, body)
+
+        if status >= 400:
+            error_message = response_body.get("message", str(response_body))
+            logger.error(
+                "Bird API error %d for %s: %s",
+                status,
+                recipient_phone,
+                error_message,
+            )
+            raise BirdAPIError(status, error_message)
+
+        logger.debug(
+            "Message sent successfully to %s, response status %d",
+            recipient_phone,
+            status,
+        )
+        return response_body
 
     async def get_message_status(self, message_id: str) -> dict[str, Any]:
         """
@@ -155,14 +375,9 @@ class BirdAPIClient:
         Raises:
             BirdAPIError: If the API returns a non-2xx status code.
         """
-        session = await self._get_session()
-        url = (
-            f"{self.base_url}/workspaces/{self.workspace_id}"
-            f"/messages/{message_id}"
+        status, body = await self._request(
+            "GET", self._message_status_base + message_id
         )
-
-        async with session.get(url) as response:
-            body = await response.json(content_type=None)
-            if response.status >= 400:
-                raise BirdAPIError(response.status, body.get("message", str(body)))
-            return body
+        if status >= 400:
+            raise BirdAPIError(status, body.get("message", str(body)))
+        return body
@@ -15,6 +15,7 @@ Commands:
 
 import asyncio
 import os
+import sys
 from typing import Any
 
 from dotenv import load_dotenv
@@ -43,14 +44,34 @@ rate_limiter = RateLimiter()
 TEMPLATE_VARS_KEY = "template_vars"
 AWAITING_BULK_KEY = "awaiting_bulk"
 
+# Shared Bird.com client stored in bot_data for the lifetime of the application
+BIRD_CLIENT_KEY = "bird"
+
 
 # ---------------------------------------------------------------------------
 # Helper
 # ---------------------------------------------------------------------------
 
-def _get_bird_client() -> BirdAPIClient:
-    """Create a fresh BirdAPIClient from environment variables."""
-    return BirdAPIClient()
+def _get_bird_client(context: ContextTypes.DEFAULT_TYPE) -> BirdAPIClient:
+    """Return the application-wide BirdAPIClient created in main()."""
+    return context.application.bot_data[BIRD_CLIENT_KEY]
+
+
+async def _close_bird_client(application: Application) -> None:
+    """Close the shared BirdAPIClient when the application shuts down."""
+    await application.bot_data[BIRD_CLIENT_KEY].close()
+
+
+def _install_uvloop() -> None:
+    """Switch asyncio to uvloop's event loop when it is available."""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop  # type: ignore[import]
+    except ImportError:
+        logger.info("uvloop is not installed; using the default asyncio event loop")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 def _get_template_config() -> tuple[str, str]:
@@ -114,7 +135,7 @@ async def send_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
     await update.message.reply_text(f"⏳ Sending message to {phone}…")
 
-    client = _get_bird_client()
+    client = _get_bird_client(context)
     try:
         await rate_limiter.acquire()
         result = await client.send_template_message(
@@ -133,8 +154,6 @@ async def send_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     except Exception as exc:  # noqa: BLE001
         logger.exception("Unexpected error sending to %s", phone)
         await update.message.reply_text(f"❌ Unexpected error: {exc}")
-    finally:
-        await client.close()
 
 
 async def setvars_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -186,9 +205,10 @@ async def document_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     tg_file = await context.bot.get_file(document.file_id)
     file_bytes = await tg_file.download_as_bytearray()
 
-    # Parse contacts
+    # Parse contacts from the download buffer in place (no bytes() copy); only
+    # python-calamine still copies .xlsx uploads into its own buffer
     try:
-        contacts = parse_contacts_file(file_name, bytes(file_bytes))
+        contacts = parse_contacts_file(file_name, file_bytes)
     except ContactParseError as exc:
         await update.message.reply_text(f"❌ Could not parse file: {exc}")
         return
@@ -206,33 +226,30 @@ async def document_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         f"📤 Sending messages to {len(contacts)} contact(s)… This may take a while."
     )
 
-    client = _get_bird_client()
-    success_count = 0
-    failure_count = 0
-
-    for contact in contacts:
-        # Per-contact variable substitution: if a 'name' field exists, prepend it
-        vars_for_contact = list(template_vars)
-        if contact.name and not vars_for_contact:
-            vars_for_contact = [contact.name]
-
-        try:
-            await rate_limiter.acquire()
-            await client.send_template_message(
-                recipient_phone=contact.phone,
-                template_id=template_id,
-                template_language=template_language,
-                template_variables=vars_for_contact or None,
-            )
-            success_count += 1
-        except BirdAPIError as exc:
-            logger.error("Failed to send to %s: %s", contact.phone, exc)
-            failure_count += 1
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Unexpected error for %s", contact.phone)
-            failure_count += 1
-
-    await client.close()
+    # Stored template variables apply to every contact, so they are passed to
+    # send_many once; otherwise each contact's name (if any) is substituted
+    if template_vars:
+        recipients = ((contact.phone, None) for contact in contacts)
+    else:
+        recipients = (
+            (contact.phone, [contact.name] if contact.name else None)
+            for contact in contacts
+        )
+
+    # Sends run concurrently (bounded by BIRD_BULK_CONCURRENCY) and are
+    # paced by the shared rate limiter
+    client = _get_bird_client(context)
+    results = await client.send_many(
+        recipients,
+        template_id=template_id,
+        template_language=template_language,
+        template_variables=template_vars or None,
+        concurrency=int(os.getenv("BIRD_BULK_CONCURRENCY", "16")),
+        rate_limiter=rate_limiter,
+    )
+    failure_count = sum(isinstance(result, Exception) for result in results)
+    success_count = len(results) - failure_count
+
     await update.message.reply_text(
         f"✅ Bulk send complete!\n"
         f"  • Sent: {success_count}\n"
@@ -262,7 +279,16 @@ def main() -> None:
     if not token:
         raise RuntimeError("TELEGRAM_BOT_TOKEN environment variable is not set")
 
-    application = Application.builder().token(token).build()
+    # Must happen before the application creates its event loop
+    _install_uvloop()
+
+    application = (
+        Application.builder()
+        .token(token)
+        .post_shutdown(_close_bird_client)
+        .build()
+    )
+    application.bot_data[BIRD_CLIENT_KEY] = BirdAPIClient()
 
     application.add_handler(CommandHandler("start", start_handler))
     application.add_handler(CommandHandler("help", help_handler))
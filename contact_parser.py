@@ -2,30 +2,47 @@
 
 import csv
 import io
+import itertools
+import os
+import re
 from dataclasses import dataclass
-from pathlib import Path
-from typing import BinaryIO
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Sequence, TextIO
 
 from logger import logger
 
+try:
+    from python_calamine import CalamineWorkbook, SheetTypeEnum
+except ImportError:  # pragma: no cover - calamine is an optional speed-up
+    CalamineWorkbook = SheetTypeEnum = None
 
-@dataclass
+# Raw file contents as accepted by the parsers (e.g. a Telegram download buffer)
+BytesLike = bytes | bytearray | memoryview
+
+
+@dataclass(slots=True)
 class Contact:
-    """Represents a single contact with a phone number and optional name."""
+    """
+    Represents a single contact with a phone number and optional name.
+
+    Fields are stored as given; the parsers pass an already normalised phone
+    number and a stripped name.
+    """
 
     phone: str
     name: str = ""
 
-    def __post_init__(self) -> None:
-        # Normalise: strip whitespace
-        self.phone = self.phone.strip()
-        self.name = self.name.strip()
-
 
 class ContactParseError(Exception):
     """Raised when the contact file cannot be parsed or contains no valid contacts."""
 
 
+# A normalised phone number: leading '+' followed by ASCII digits only
+_PHONE_RE = re.compile(r"\+[0-9]+")
+
+# A number exported as a float by a spreadsheet, e.g. 14155552671.0
+_FLOAT_PHONE_RE = re.compile(r"(\+?[0-9]+)\.0+")
+
+
 def _normalise_phone(raw: str) -> str:
     """
     Ensure the phone number is in E.164 format (starts with '+').
@@ -39,136 +56,204 @@ def _normalise_phone(raw: str) -> str:
     Raises:
         ValueError: If the number is empty or contains non-digit/plus characters.
     """
-    number = raw.strip().replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+    number = raw.strip()
+    # Drop a float's ".0" before dots are stripped as separators, or
+    # 14155552671.0 would become +141555526710
+    if "." in number and (float_match := _FLOAT_PHONE_RE.fullmatch(number)):
+        number = float_match[1]
+    # Chained str.replace is 1.3-3x faster than str.translate with a deletion
+    # table: a replace with no match returns almost immediately.
+    number = (
+        number
+        .replace(" ", "")
+        .replace("-", "")
+        .replace("(", "")
+        .replace(")", "")
+        .replace("\t", "")
+        .replace(".", "")
+    )
     if not number:
         raise ValueError("Empty phone number")
     if not number.startswith("+"):
         number = "+" + number
-    # Allow only digits and leading '+'
-    if not number[1:].isdigit():
+    if not _PHONE_RE.fullmatch(number):
         raise ValueError(f"Invalid phone number: {raw!r}")
     return number
 
 
-def parse_contacts_csv(data: str | bytes) -> list[Contact]:
+class _BufferReader(io.RawIOBase):
+    """Seekable, read-only raw stream over a bytes-like object, sharing its memory."""
+
+    def __init__(self, data: BytesLike) -> None:
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        chunk = self._view[self._pos : self._pos + len(buffer)]
+        size = len(chunk)
+        buffer[:size] = chunk
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"Invalid whence: {whence!r}")
+        if offset < 0:
+            raise ValueError(f"Negative seek position: {offset}")
+        self._pos = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        # Release the buffer export so a bytearray can be resized again
+        self._view.release()
+        super().close()
+
+
+def _binary_stream(data: BytesLike) -> BinaryIO:
+    """Return a seekable binary file object reading ``data`` without copying it."""
+    # BytesIO shares an immutable bytes object, but copies bytearray/memoryview
+    if isinstance(data, bytes):
+        return io.BytesIO(data)
+    return io.BufferedReader(_BufferReader(data))
+
+
+def iter_contacts_csv(data: str | BytesLike) -> Iterator[Contact]:
     """
-    Parse a CSV file containing contacts.
+    Lazily yield contacts from a CSV file.
 
     Expected columns (case-insensitive): ``phone`` (required), ``name`` (optional).
     If no header row is detected the first column is assumed to be phone numbers.
+    Bytes input is decoded incrementally as rows are read, so neither the
+    decoded text nor the full contact list is held in memory at once.
 
     Args:
-        data: Raw CSV content as string or bytes.
+        data: Raw CSV content as string or bytes-like object.
 
-    Returns:
-        List of valid Contact objects.
-
-    Raises:
-        ContactParseError: If no valid contacts could be parsed.
+    Yields:
+        Valid Contact objects; rows with invalid phone numbers are logged and
+        skipped.
     """
-    if isinstance(data, bytes):
-        data = data.decode("utf-8-sig")  # handle BOM
-
-    contacts: list[Contact] = []
-    skipped = 0
+    if isinstance(data, str):
+        stream: TextIO = io.StringIO(data)
+    else:
+        # utf-8-sig handles the BOM Excel adds to exported CSVs
+        stream = io.TextIOWrapper(
+            _binary_stream(data), encoding="utf-8-sig", newline=""
+        )
 
-    # Peek at the first row to decide whether a header exists
-    sniffer_reader = csv.reader(io.StringIO(data))
-    first_row = next(sniffer_reader, [])
-    first_row_lower = [c.lower().strip() for c in first_row]
-    has_header = "phone" in first_row_lower
-
-    if has_header:
-        reader = csv.DictReader(io.StringIO(data))
-        fieldnames = [f.lower().strip() for f in (reader.fieldnames or [])]
-        phone_col = reader.fieldnames[fieldnames.index("phone")]
-        name_col = None
-        if "name" in fieldnames:
-            name_col = reader.fieldnames[fieldnames.index("name")]
-
-        for row in reader:
-            raw_phone = row.get(phone_col, "").strip()
+    try:
+        skipped = 0
+
+        # Peek at the first row to decide whether a header exists, then keep
+        # consuming the same reader so the file is tokenized only once
+        reader = csv.reader(stream)
+        first_row = next(reader, [])
+        first_row_lower = [c.lower().strip() for c in first_row]
+        has_header = "phone" in first_row_lower
+
+        if has_header:
+            phone_idx = first_row_lower.index("phone")
+            name_idx = first_row_lower.index("name") if "name" in first_row_lower else None
+            rows: Iterable[list[str]] = reader
+        else:
+            # No header: first row is data; first column is phone, second is name
+            phone_idx, name_idx = 0, 1
+            rows = itertools.chain((first_row,), reader)
+
+        for row in rows:
+            if not row:
+                continue
+            raw_phone = row[phone_idx].strip() if len(row) > phone_idx else ""
             try:
                 phone = _normalise_phone(raw_phone)
             except ValueError:
                 logger.warning("Skipping invalid phone number: %r", raw_phone)
                 skipped += 1
                 continue
-            name = row.get(name_col, "").strip() if name_col else ""
-            contacts.append(Contact(phone=phone, name=name))
-    else:
-        # No header: treat every row as data; first column is phone, second is name
-        all_rows = [first_row] + list(sniffer_reader)
-        for row_values in all_rows:
-            if not row_values:
-                continue
-            try:
-                phone = _normalise_phone(row_values[0])
-            except ValueError:
-                logger.warning("Skipping invalid phone number: %r", row_values[0])
-                skipped += 1
-                continue
-            name = row_values[1].strip() if len(row_values) > 1 else ""
-            contacts.append(Contact(phone=phone, name=name))
+            name = ""
+            if name_idx is not None and len(row) > name_idx:
+                name = row[name_idx].strip()
+            yield Contact(phone=phone, name=name)
 
-    if skipped:
-        logger.info("Skipped %d invalid rows during CSV parsing", skipped)
+        if skipped:
+            logger.info("Skipped %d invalid rows during CSV parsing", skipped)
+    finally:
+        # Release the upload buffer even if the caller stops iterating early
+        stream.close()
 
-    if not contacts:
-        raise ContactParseError("No valid contacts found in CSV file")
 
-    logger.info("Parsed %d contacts from CSV", len(contacts))
-    return contacts
-
-
-def parse_contacts_excel(data: bytes) -> list[Contact]:
+def parse_contacts_csv(data: str | BytesLike) -> list[Contact]:
     """
-    Parse an Excel (.xlsx) file containing contacts.
+    Parse a CSV file containing contacts.
 
-    Expected columns (case-insensitive): ``phone`` (required), ``name`` (optional).
-    If the first row does not look like a header the first column is treated as phones.
+    See :func:`iter_contacts_csv` for the accepted layout.
 
     Args:
-        data: Raw bytes of the Excel file.
+        data: Raw CSV content as string or bytes-like object.
 
     Returns:
         List of valid Contact objects.
 
     Raises:
         ContactParseError: If no valid contacts could be parsed.
-        ImportError: If openpyxl is not installed.
     """
-    try:
-        import openpyxl  # type: ignore[import]
-    except ImportError as exc:
-        raise ImportError(
-            "openpyxl is required to parse Excel files. "
-            "Install it with: pip install openpyxl"
-        ) from exc
-
-    workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
-    sheet = workbook.active
-    rows = list(sheet.iter_rows(values_only=True))
-
-    if not rows:
+    contacts = list(iter_contacts_csv(data))
+
+    if not contacts:
+        raise ContactParseError("No valid contacts found in CSV file")
+
+    logger.info("Parsed %d contacts from CSV", len(contacts))
+    return contacts
+
+
+def _cell_text(value: Any) -> str:
+    """Render an Excel cell as text, without a trailing .0 on whole numbers."""
+    # calamine reports blank cells as "" and every number as a float, so a
+    # phone typed as a number comes back as 14155552671.0
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _parse_excel_rows(rows: Iterator[Sequence[Any]]) -> tuple[list[Contact], int]:
+    """Parse worksheet rows of cell values; return (contacts, skipped_count)."""
+    # Stream rows lazily, peeking at the first one to detect a header
+    first = next(rows, None)
+
+    if first is None:
         raise ContactParseError("Excel file is empty")
 
     contacts: list[Contact] = []
     skipped = 0
-    start_row = 0
 
     # Detect header row
-    first_row = [str(c).lower().strip() if c is not None else "" for c in rows[0]]
+    first_row = [_cell_text(c).lower().strip() for c in first]
     has_header = "phone" in first_row
     phone_idx = first_row.index("phone") if has_header else 0
     name_idx = first_row.index("name") if (has_header and "name" in first_row) else None
-    start_row = 1 if has_header else 0
+    if not has_header:
+        rows = itertools.chain((first,), rows)
 
-    for row in rows[start_row:]:
-        if not row or row[phone_idx] is None:
+    for row in rows:
+        raw_phone = _cell_text(row[phone_idx]) if len(row) > phone_idx else ""
+        if not raw_phone:
             skipped += 1
             continue
-        raw_phone = str(row[phone_idx])
         try:
             phone = _normalise_phone(raw_phone)
         except ValueError:
@@ -176,11 +261,73 @@ def parse_contacts_excel(data: bytes) -> list[Contact]:
             skipped += 1
             continue
         name = ""
-        if name_idx is not None and len(row) > name_idx and row[name_idx] is not None:
-            name = str(row[name_idx]).strip()
+        if name_idx is not None and len(row) > name_idx:
+            name = _cell_text(row[name_idx]).strip()
         contacts.append(Contact(phone=phone, name=name))
 
-    workbook.close()
+    return contacts, skipped
+
+
+def parse_contacts_excel(data: BytesLike) -> list[Contact]:
+    """
+    Parse an Excel (.xlsx) file containing contacts.
+
+    Expected columns (case-insensitive): ``phone`` (required), ``name`` (optional).
+    If the first row does not look like a header the first column is treated as phones.
+    Contacts are read from the first worksheet, not the tab that was active
+    when the file was saved (python-calamine cannot report it); chart sheets
+    are skipped.
+
+    Args:
+        data: Raw bytes (or bytes-like object) of the Excel file.
+
+    Returns:
+        List of valid Contact objects.
+
+    Raises:
+        ContactParseError: If no valid contacts could be parsed.
+        ImportError: If neither python-calamine nor openpyxl is installed.
+    """
+    if CalamineWorkbook is None:
+        try:
+            import openpyxl  # type: ignore[import]
+        except ImportError as exc:
+            raise ImportError(
+                "python-calamine or openpyxl is required to parse Excel files. "
+                "Install one with: pip install python-calamine"
+            ) from exc
+
+    # Closing the stream releases its view of a bytearray/memoryview upload
+    stream = _binary_stream(data)
+    try:
+        if CalamineWorkbook is not None:
+            # Rust-backed reader, much faster than openpyxl. It reads the whole
+            # stream into a buffer of its own, so this path still holds one
+            # copy of the upload while parsing.
+            workbook = CalamineWorkbook.from_filelike(stream)
+            sheet_names = [
+                sheet.name
+                for sheet in workbook.sheets_metadata
+                if sheet.typ == SheetTypeEnum.WorkSheet
+            ]
+            rows = (
+                workbook.get_sheet_by_name(sheet_names[0]).iter_rows()
+                if sheet_names
+                else iter(())
+            )
+        else:
+            # Read-only mode streams the sheet XML and keeps memory close to
+            # file size, but holds the archive open until the workbook is closed
+            workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+            sheets = workbook.worksheets
+            rows = sheets[0].iter_rows(values_only=True) if sheets else iter(())
+
+        try:
+            contacts, skipped = _parse_excel_rows(rows)
+        finally:
+            workbook.close()
+    finally:
+        stream.close()
 
     if skipped:
         logger.info("Skipped %d invalid rows during Excel parsing", skipped)
@@ -192,13 +339,13 @@ def parse_contacts_excel(data: bytes) -> list[Contact]:
     return contacts
 
 
-def parse_contacts_file(filename: str, data: bytes) -> list[Contact]:
+def parse_contacts_file(filename: str, data: BytesLike) -> list[Contact]:
     """
     Dispatch to the correct parser based on file extension.
 
     Args:
         filename: Original filename (used to detect format).
-        data: Raw file bytes.
+        data: Raw file bytes (or bytes-like object).
 
     Returns:
         List of valid Contact objects.
@@ -206,12 +353,17 @@ def parse_contacts_file(filename: str, data: bytes) -> list[Contact]:
     Raises:
         ContactParseError: If the format is unsupported or parsing fails.
     """
-    ext = Path(filename).suffix.lower()
-    if ext == ".csv":
-        return parse_contacts_csv(data)
-    elif ext == ".xlsx":
-        return parse_contacts_excel(data)
-    else:
+    ext = os.path.splitext(filename)[1].lower()
+    parser = _PARSERS.get(ext)
+    if parser is None:
         raise ContactParseError(
             f"Unsupported file format: {ext!r}. Please upload a .csv or .xlsx file."
         )
+    return parser(data)
+
+
+# Legacy .xls is deliberately absent: the openpyxl fallback cannot read BIFF
+_PARSERS: dict[str, Callable[[BytesLike], list[Contact]]] = {
+    ".csv": parse_contacts_csv,
+    ".xlsx": parse_contacts_excel,
+}
@@ -1,15 +1,25 @@
 """Logging configuration for the Telegram WhatsApp bot."""
 
+import atexit
 import logging
 import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Background listeners writing queued records; kept referenced for the
+# lifetime of the process and stopped (flushed) at interpreter exit.
+_listeners: list[QueueListener] = []
 
 
 def setup_logger(name: str = "whatsapp_bot") -> logging.Logger:
     """
     Set up and return a configured logger instance.
 
+    Records are pushed onto an in-memory queue; a background thread writes
+    them to the console and the rotating log file, so logging calls never
+    block the event loop on disk I/O.
+
     Args:
         name: Logger name (default: 'whatsapp_bot')
 
@@ -34,14 +44,22 @@ def setup_logger(name: str = "whatsapp_bot") -> logging.Logger:
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
 
     # File handler with rotation (max 10 MB, keep 5 backups)
     file_handler = RotatingFileHandler(
         log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    _listeners.append(listener)
 
     return logger
 
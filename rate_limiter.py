@@ -4,12 +4,19 @@ import asyncio
 import time
 import os
 from collections import deque
-from typing import Deque
+
+_SECOND_NS = 1_000_000_000
+_MINUTE_NS = 60 * _SECOND_NS
 
 
 class RateLimiter:
     """
-    Token-bucket based rate limiter that enforces per-second and per-minute limits.
+    Sliding-window rate limiter that enforces per-second and per-minute limits.
+
+    Any one-second span holds at most ``messages_per_second`` sends and any
+    sixty-second span at most ``messages_per_minute``. Each window keeps only
+    the timestamps of its last ``limit`` sends, so checking a window is O(1):
+    the next send is allowed once the oldest of those is a full window old.
 
     Attributes:
         messages_per_second: Maximum messages allowed per second.
@@ -28,17 +35,22 @@ class RateLimiter:
             os.getenv("RATE_LIMIT_MESSAGES_PER_MINUTE", "100")
         )
 
-        # Sliding window queues storing timestamps of sent messages
-        self._second_window: Deque[float] = deque()
-        self._minute_window: Deque[float] = deque()
+        # time.monotonic_ns() timestamps of the last `limit` sends per window,
+        # oldest first; maxlen drops the oldest as each new one is recorded
+        self._second_window: deque[int] = deque(maxlen=self.messages_per_second)
+        self._minute_window: deque[int] = deque(maxlen=self.messages_per_minute)
         self._lock = asyncio.Lock()
 
-    def _clean_windows(self, now: float) -> None:
-        """Remove expired timestamps from sliding windows."""
-        while self._second_window and self._second_window[0] <= now - 1:
-            self._second_window.popleft()
-        while self._minute_window and self._minute_window[0] <= now - 60:
-            self._minute_window.popleft()
+    def _wait_ns(self, now: int) -> int:
+        """Return how many nanoseconds from ``now`` until both windows allow a send."""
+        wait = 0
+        for window, length in (
+            (self._second_window, _SECOND_NS),
+            (self._minute_window, _MINUTE_NS),
+        ):
+            if len(window) == window.maxlen:
+                wait = max(wait, window[0] + length - now)
+        return wait
 
     async def acquire(self) -> None:
         """
@@ -46,46 +58,31 @@ class RateLimiter:
 
         This method blocks asynchronously until rate limits allow the next send.
         """
+        # The lock queues callers in arrival order. The caller at the front
+        # sleeps exactly as long as the windows require (no polling), and is the
+        # only one that could send next anyway, so it keeps the lock while
+        # sleeping. A caller cancelled while waiting has recorded nothing.
         async with self._lock:
-            while True:
-                now = time.monotonic()
-                self._clean_windows(now)
-
-                per_second_ok = len(self._second_window) < self.messages_per_second
-                per_minute_ok = len(self._minute_window) < self.messages_per_minute
-
-                if per_second_ok and per_minute_ok:
-                    self._second_window.append(now)
-                    self._minute_window.append(now)
-                    return
+            # Timers may fire marginally early, so re-check against the clock
+            while (wait := self._wait_ns(time.monotonic_ns())) > 0:
+                await asyncio.sleep(wait / _SECOND_NS)
 
-                # Calculate wait time
-                wait = 0.0
-                if not per_second_ok:
-                    wait = max(wait, self._second_window[0] + 1 - now)
-                if not per_minute_ok:
-                    wait = max(wait, self._minute_window[0] + 60 - now)
+            now = time.monotonic_ns()
+            self._second_window.append(now)
+            self._minute_window.append(now)
 
-                # Release lock while sleeping so other coroutines can proceed.
-                # The try/finally guarantees the lock is always re-acquired after
-                # sleeping, keeping the invariant that we hold the lock at the
-                # top of the while loop.
-                self._lock.release()
-                try:
-                    await asyncio.sleep(wait)
-                finally:
-                    await self._lock.acquire()
+    @staticmethod
+    def _count_recent(window: deque[int], length: int) -> int:
+        """Count the sends in ``window`` made during the last ``length`` ns."""
+        cutoff = time.monotonic_ns() - length
+        return sum(1 for sent in window if sent > cutoff)
 
     @property
     def current_second_count(self) -> int:
         """Return the number of messages sent in the current second window."""
-        now = time.monotonic()
-        self._clean_windows(now)
-        return len(self._second_window)
+        return self._count_recent(self._second_window, _SECOND_NS)
 
     @property
     def current_minute_count(self) -> int:
         """Return the number of messages sent in the current minute window."""
-        now = time.monotonic()
-        self._clean_windows(now)
-        return len(self._minute_window)
+        return self._count_recent(self._minute_window, _MINUTE_NS)
@@ -0,0 +1,69 @@
+"""Local HTTP server answering Bird API calls from a route table, for the tests."""
+
+from dataclasses import dataclass, field
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# A canned reply: (HTTP status, raw response body)
+Reply = tuple[int, bytes]
+
+
+@dataclass
+class RecordedRequest:
+    """A request as it arrived at the mock server."""
+
+    method: str
+    path: str
+    data: bytes
+    headers: dict[str, str]
+
+
+@dataclass
+class MockServer:
+    """
+    Serve canned replies over real HTTP from a route table keyed by ``(method, path)``.
+
+    Clients talk to it through an ordinary ``aiohttp.ClientSession``, so the
+    whole request path (connector, session headers, body encoding, response
+    reading) is exercised. A route maps to a single reply, returned for every
+    matching request, or to a list of replies handed out in order. Requests
+    without a route get a 501 naming the missing route.
+    """
+
+    routes: dict[tuple[str, str], Reply | list[Reply]] = field(default_factory=dict)
+    requests: list[RecordedRequest] = field(default_factory=list)
+    _server: TestServer | None = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._server = TestServer(app)
+        await self._server.start_server()
+
+    @property
+    def base_url(self) -> str:
+        """The server's root URL, for use as a BirdAPIClient ``base_url``."""
+        return str(self._server.make_url("/")).rstrip("/")
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        self.requests.append(
+            RecordedRequest(request.method, request.path, body, dict(request.headers))
+        )
+        route = self.routes.get((request.method, request.path))
+        if route is None:
+            return web.json_response(
+                {"message": f"No mock route for {request.method} {request.path}"},
+                status=501,
+            )
+        status, body = route.pop(0) if isinstance(route, list) else route
+        return web.Response(status=status, body=body, content_type="application/json")
+
+    def reset(self) -> None:
+        """Forget all routes and recorded requests."""
+        self.routes.clear()
+        self.requests.clear()
+
+    async def close(self) -> None:
+        await self._server.close()
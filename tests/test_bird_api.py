@@ -1,7 +1,8 @@
 """Unit tests for the Bird.com API client (bird_api.py)."""
 
+import json
 import pytest
-from aioresponses import aioresponses
+import pytest_asyncio
 from unittest.mock import patch
 import os
 
@@ -10,18 +11,27 @@ os.environ.setdefault("BIRD_API_KEY", "test_api_key")
 os.environ.setdefault("BIRD_WORKSPACE_ID", "ws123")
 os.environ.setdefault("BIRD_CHANNEL_ID", "ch456")
 
+import bird_api  # noqa: E402
 from bird_api import BirdAPIClient, BirdAPIError  # noqa: E402
+import aiohttp  # noqa: E402
+from _mock_transport import MockServer  # noqa: E402
 
 
 WORKSPACE_ID = "ws123"
 CHANNEL_ID = "ch456"
-MESSAGES_URL = (
-    f"https://api.bird.com/workspaces/{WORKSPACE_ID}/channels/{CHANNEL_ID}/messages"
-)
+MESSAGES_PATH = f"/workspaces/{WORKSPACE_ID}/channels/{CHANNEL_ID}/messages"
+MESSAGES_URL = f"https://api.bird.com{MESSAGES_PATH}"
+STATUS_PATH = f"/workspaces/{WORKSPACE_ID}/messages/{{}}".format
 
+# Canned response bodies, serialised once instead of on every mock registration
+ACCEPTED = {"id": "msg-001", "status": "accepted"}
+ACCEPTED_BODY = bird_api._json_dumps(ACCEPTED)
+INVALID_TEMPLATE_BODY = bird_api._json_dumps({"message": "Invalid template"})
+SERVER_ERROR_BODY = bird_api._json_dumps({"message": "Internal error"})
+NOT_FOUND_BODY = bird_api._json_dumps({"message": "Not found"})
 
-@pytest.fixture
-def client():
+
+def _make_client() -> BirdAPIClient:
     return BirdAPIClient(
         api_key="test_key",
         workspace_id=WORKSPACE_ID,
@@ -29,107 +39,179 @@ def client():
     )
 
 
+@pytest_asyncio.fixture(scope="session")
+async def _server():
+    """One local mock Bird API server for the whole test session."""
+    server = MockServer()
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+def mocked(_server):
+    """The shared mock server, reset after every test."""
+    yield _server
+    _server.reset()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(_server):
+    """A single client, on its own aiohttp session, shared by every test."""
+    client = BirdAPIClient(
+        api_key="test_key",
+        workspace_id=WORKSPACE_ID,
+        channel_id=CHANNEL_ID,
+        base_url=_server.base_url,
+    )
+    yield client
+    await client.close()
+
+
 @pytest.mark.asyncio
-async def test_send_template_message_success(client):
+async def test_send_template_message_success(client, mocked):
     """A 200 response should return the parsed JSON body."""
-    response_body = {"id": "msg-001", "status": "accepted"}
+    mocked.routes[("POST", MESSAGES_PATH)] = (200, ACCEPTED_BODY)
+    result = await client.send_template_message(
+        recipient_phone="+14155552671",
+        template_id="tmpl_hello",
+        template_language="en",
+        template_variables=["Alice"],
+    )
 
-    with aioresponses() as mock:
-        mock.post(MESSAGES_URL, status=200, payload=response_body)
-        result = await client.send_template_message(
-            recipient_phone="+14155552671",
-            template_id="tmpl_hello",
-            template_language="en",
-            template_variables=["Alice"],
-        )
+    assert result == ACCEPTED
 
-    assert result["id"] == "msg-001"
-    assert result["status"] == "accepted"
-    await client.close()
+
+@pytest.mark.asyncio
+async def test_send_template_message_payload_variables(client, mocked):
+    """Template variables should be keyed by their position as strings."""
+    mocked.routes[("POST", MESSAGES_PATH)] = (200, ACCEPTED_BODY)
+    await client.send_template_message(
+        recipient_phone="+14155552671",
+        template_id="tmpl_hello",
+        template_variables=["Alice", "20OFF"],
+    )
+    (request,) = mocked.requests
+
+    assert request.headers["Authorization"] == "AccessKey test_key"
+    assert request.headers["Content-Type"] == "application/json"
+    payload = json.loads(request.data)
+    assert payload["template"]["variables"] == {"0": "Alice", "1": "20OFF"}
 
 
 @pytest.mark.asyncio
-async def test_send_template_message_no_variables(client):
+async def test_send_template_message_no_variables(client, mocked):
     """Sending without template variables should still succeed."""
-    response_body = {"id": "msg-002"}
-
-    with aioresponses() as mock:
-        mock.post(MESSAGES_URL, status=201, payload=response_body)
-        result = await client.send_template_message(
-            recipient_phone="+14155552671",
-            template_id="tmpl_hello",
-        )
+    mocked.routes[("POST", MESSAGES_PATH)] = (201, ACCEPTED_BODY)
+    result = await client.send_template_message(
+        recipient_phone="+14155552671",
+        template_id="tmpl_hello",
+    )
 
-    assert result["id"] == "msg-002"
-    await client.close()
+    assert result["id"] == ACCEPTED["id"]
 
 
 @pytest.mark.asyncio
-async def test_send_template_message_api_error(client):
+async def test_send_template_message_api_error(client, mocked):
     """A 4xx response should raise BirdAPIError."""
-    response_body = {"message": "Invalid template"}
-
-    with aioresponses() as mock:
-        mock.post(MESSAGES_URL, status=400, payload=response_body)
-        with pytest.raises(BirdAPIError) as exc_info:
-            await client.send_template_message(
-                recipient_phone="+14155552671",
-                template_id="tmpl_bad",
-            )
+    mocked.routes[("POST", MESSAGES_PATH)] = (400, INVALID_TEMPLATE_BODY)
+    with pytest.raises(BirdAPIError) as exc_info:
+        await client.send_template_message(
+            recipient_phone="+14155552671",
+            template_id="tmpl_bad",
+        )
 
     assert exc_info.value.status == 400
     assert "Invalid template" in exc_info.value.message
-    await client.close()
 
 
 @pytest.mark.asyncio
-async def test_send_template_message_server_error(client):
+async def test_send_template_message_server_error(client, mocked):
     """A 5xx response should raise BirdAPIError."""
-    with aioresponses() as mock:
-        mock.post(MESSAGES_URL, status=500, payload={"message": "Internal error"})
-        with pytest.raises(BirdAPIError) as exc_info:
-            await client.send_template_message(
-                recipient_phone="+14155552671",
-                template_id="tmpl_hello",
-            )
+    mocked.routes[("POST", MESSAGES_PATH)] = (500, SERVER_ERROR_BODY)
+    with pytest.raises(BirdAPIError) as exc_info:
+        await client.send_template_message(
+            recipient_phone="+14155552671",
+            template_id="tmpl_hello",
+        )
 
     assert exc_info.value.status == 500
-    await client.close()
 
 
 @pytest.mark.asyncio
-async def test_get_message_status_success(client):
+async def test_send_many_mixed_results(client, mocked):
+    """send_many should return one result per recipient, in order."""
+    mocked.routes[("POST", MESSAGES_PATH)] = [
+        (200, ACCEPTED_BODY),
+        (400, INVALID_TEMPLATE_BODY),
+    ]
+    results = await client.send_many(
+        [("+14155552671", ["Alice"]), ("+14155552672", None)],
+        template_id="tmpl_hello",
+        concurrency=1,
+    )
+
+    assert results[0] == ACCEPTED
+    assert isinstance(results[1], BirdAPIError)
+    assert results[1].status == 400
+
+    payloads = [json.loads(request.data) for request in mocked.requests]
+    receivers = [p["receiver"]["contacts"][0]["identifierValue"] for p in payloads]
+    assert receivers == ["+14155552671", "+14155552672"]
+    assert payloads[0]["template"]["variables"] == {"0": "Alice"}
+    assert payloads[1]["template"]["variables"] == {}
+
+
+@pytest.mark.asyncio
+async def test_send_many_shared_variables(client, mocked):
+    """Recipients without their own variables should get the shared ones."""
+    mocked.routes[("POST", MESSAGES_PATH)] = (200, ACCEPTED_BODY)
+    await client.send_many(
+        [("+14155552671", None), ("+14155552672", ["Bob"]), ("+14155552673", None)],
+        template_id="tmpl_hello",
+        template_variables=["20OFF", "Friday"],
+        concurrency=1,
+    )
+
+    payloads = [json.loads(request.data) for request in mocked.requests]
+    receivers = [p["receiver"]["contacts"][0]["identifierValue"] for p in payloads]
+    assert receivers == ["+14155552671", "+14155552672", "+14155552673"]
+    assert [p["template"]["variables"] for p in payloads] == [
+        {"0": "20OFF", "1": "Friday"},
+        {"0": "Bob"},
+        {"0": "20OFF", "1": "Friday"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_message_status_success(client, mocked):
     """get_message_status should return parsed JSON on success."""
     msg_id = "msg-999"
-    status_url = f"https://api.bird.com/workspaces/{WORKSPACE_ID}/messages/{msg_id}"
-    response_body = {"id": msg_id, "status": "delivered"}
-
-    with aioresponses() as mock:
-        mock.get(status_url, status=200, payload=response_body)
-        result = await client.get_message_status(msg_id)
+    mocked.routes[("GET", STATUS_PATH(msg_id))] = (
+        200,
+        bird_api._json_dumps({"id": msg_id, "status": "delivered"}),
+    )
+    result = await client.get_message_status(msg_id)
 
     assert result["status"] == "delivered"
-    await client.close()
 
 
 @pytest.mark.asyncio
-async def test_get_message_status_not_found(client):
+async def test_get_message_status_not_found(client, mocked):
     """get_message_status should raise BirdAPIError for 404."""
     msg_id = "bad-id"
-    status_url = f"https://api.bird.com/workspaces/{WORKSPACE_ID}/messages/{msg_id}"
 
-    with aioresponses() as mock:
-        mock.get(status_url, status=404, payload={"message": "Not found"})
-        with pytest.raises(BirdAPIError) as exc_info:
-            await client.get_message_status(msg_id)
+    mocked.routes[("GET", STATUS_PATH(msg_id))] = (404, NOT_FOUND_BODY)
+    with pytest.raises(BirdAPIError) as exc_info:
+        await client.get_message_status(msg_id)
 
     assert exc_info.value.status == 404
-    await client.close()
 
 
 @pytest.mark.asyncio
-async def test_close_session(client):
+async def test_close_session():
     """close() should close the underlying session."""
+    client = _make_client()
     # Trigger session creation
     await client._get_session()
     assert client._session is not None
@@ -139,6 +221,73 @@ async def test_close_session(client):
     assert client._session.closed
 
 
+@pytest.mark.asyncio
+async def test_injected_session(mocked):
+    """A caller's session should carry the auth headers and stay open on close()."""
+    mocked.routes[("POST", MESSAGES_PATH)] = (200, ACCEPTED_BODY)
+    async with aiohttp.ClientSession() as session:
+        client = BirdAPIClient(
+            api_key="k",
+            workspace_id=WORKSPACE_ID,
+            channel_id=CHANNEL_ID,
+            base_url=mocked.base_url,
+            session=session,
+        )
+        result = await client.send_template_message("+14155552671", "tmpl_hello")
+        assert result == ACCEPTED
+
+        await client.close()
+        assert not session.closed
+
+    (request,) = mocked.requests
+    assert request.headers["Authorization"] == "AccessKey k"
+    assert request.headers["Content-Type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_session_connector_pool(monkeypatch):
+    """The session connector should be sized for a single busy host."""
+    monkeypatch.setenv("BIRD_POOL_PER_HOST", "8")
+    client = _make_client()
+    session = await client._get_session()
+
+    assert session.connector.limit == 0
+    assert session.connector.limit_per_host == 8
+    assert session.timeout.total == 30
+    await client.close()
+
+
+def test_http2_falls_back_without_httpx(monkeypatch):
+    """BIRD_USE_HTTP2 should be ignored when httpx[http2] is unavailable."""
+    monkeypatch.setenv("BIRD_USE_HTTP2", "1")
+    monkeypatch.setattr(bird_api, "httpx", None)
+    client = BirdAPIClient(api_key="k", workspace_id=WORKSPACE_ID, channel_id=CHANNEL_ID)
+    assert client.use_http2 is False
+
+
+@pytest.mark.asyncio
+async def test_send_template_message_http2(monkeypatch):
+    """With BIRD_USE_HTTP2=1 requests should go through the httpx client."""
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    monkeypatch.setenv("BIRD_USE_HTTP2", "1")
+    client = BirdAPIClient(api_key="k", workspace_id=WORKSPACE_ID, channel_id=CHANNEL_ID)
+
+    def handler(request):
+        assert str(request.url) == MESSAGES_URL
+        return httpx.Response(200, json={"id": "msg-h2"})
+
+    client._http2_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    result = await client.send_template_message(
+        recipient_phone="+14155552671",
+        template_id="tmpl_hello",
+    )
+
+    assert result["id"] == "msg-h2"
+    await client.close()
+    assert client._http2_client.is_closed
+
+
 def test_bird_api_error_str():
     """BirdAPIError should contain status and message in string representation."""
     err = BirdAPIError(403, "Forbidden")
@@ -1,10 +1,11 @@
 """Unit tests for the contact parser (contact_parser.py)."""
 
+import functools
 import io
 from typing import Any
 import pytest
-import openpyxl
 
+import contact_parser
 from contact_parser import (
     Contact,
     ContactParseError,
@@ -12,6 +13,7 @@ from contact_parser import (
     parse_contacts_excel,
     parse_contacts_file,
     _normalise_phone,
+    iter_contacts_csv,
 )
 
 
@@ -31,6 +33,11 @@ def test_normalise_phone_strips_spaces_dashes():
     assert _normalise_phone("+1 415-555-2671") == "+14155552671"
 
 
+def test_normalise_phone_strips_dots_and_tabs():
+    assert _normalise_phone("415.555.2671") == "+4155552671"
+    assert _normalise_phone("+1\t415\t5552671") == "+14155552671"
+
+
 def test_normalise_phone_empty_raises():
     with pytest.raises(ValueError):
         _normalise_phone("")
@@ -41,6 +48,11 @@ def test_normalise_phone_invalid_raises():
         _normalise_phone("not-a-number")
 
 
+def test_normalise_phone_non_ascii_digits_raises():
+    with pytest.raises(ValueError):
+        _normalise_phone("+1415555267²")
+
+
 # ---------------------------------------------------------------------------
 # parse_contacts_csv
 # ---------------------------------------------------------------------------
@@ -76,6 +88,14 @@ def test_csv_skips_invalid_phones():
     assert contacts[0].phone == "+14155552671"
 
 
+def test_csv_short_rows_and_blank_lines():
+    csv_data = "name,phone\nAlice\n\nBob,+14155552671\n"
+    contacts = parse_contacts_csv(csv_data)
+    assert len(contacts) == 1
+    assert contacts[0].phone == "+14155552671"
+    assert contacts[0].name == "Bob"
+
+
 def test_csv_empty_raises():
     with pytest.raises(ContactParseError):
         parse_contacts_csv("phone,name\n")
@@ -87,6 +107,11 @@ def test_csv_bytes_input():
     assert len(contacts) == 1
 
 
+def test_csv_memoryview_input():
+    csv_view = memoryview(b"phone,name\n+14155552671,Alice\n")
+    assert [c.name for c in parse_contacts_csv(csv_view)] == ["Alice"]
+
+
 def test_csv_bom_handling():
     # UTF-8 BOM prefix
     csv_bytes = "\ufeffphone,name\n+14155552671,Alice\n".encode("utf-8-sig")
@@ -94,27 +119,78 @@ def test_csv_bom_handling():
     assert len(contacts) == 1
 
 
+def test_iter_contacts_csv_is_lazy():
+    csv_bytes = b"phone,name\n+14155552671,Alice\n+442071234567,Bob\n"
+    contacts = iter_contacts_csv(csv_bytes)
+    assert next(contacts).name == "Alice"
+    assert [c.name for c in contacts] == ["Bob"]
+
+
+def test_iter_contacts_csv_closed_early_releases_buffer():
+    csv_data = bytearray(b"phone,name\n+14155552671,Alice\n+442071234567,Bob\n")
+    contacts = iter_contacts_csv(csv_data)
+    next(contacts)
+    contacts.close()
+    csv_data.clear()
+
+
+def test_iter_contacts_csv_empty_yields_nothing():
+    assert list(iter_contacts_csv("phone,name\n")) == []
+
+
 def test_csv_no_plus_normalised():
     csv_data = "phone\n14155552671\n"
     contacts = parse_contacts_csv(csv_data)
     assert contacts[0].phone == "+14155552671"
 
 
+def test_csv_float_phone_keeps_digits():
+    # Spreadsheet exports often write phone numbers as floats
+    contacts = parse_contacts_csv("phone\n14155552671.0\n")
+    assert contacts[0].phone == "+14155552671"
+
+
+def test_csv_dotted_phone():
+    contacts = parse_contacts_csv("phone\n415.555.2671\n415.555.0000\n")
+    assert [c.phone for c in contacts] == ["+4155552671", "+4155550000"]
+
+
 # ---------------------------------------------------------------------------
 # parse_contacts_excel
 # ---------------------------------------------------------------------------
 
 def _make_excel(rows: list[tuple[Any, ...]]) -> bytes:
     """Create an in-memory Excel workbook and return its bytes."""
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    for row in rows:
-        ws.append(row)
+    return _build_excel(tuple(rows))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_excel(rows: tuple[tuple[Any, ...], ...]) -> bytes:
+    """Build each distinct workbook once; the returned bytes are immutable."""
+    # Imported here so CSV-only runs don't pay for it at collection time
+    import xlsxwriter
+
     buf = io.BytesIO()
-    wb.save(buf)
+    wb = xlsxwriter.Workbook(buf, {"in_memory": True})
+    ws = wb.add_worksheet()
+    for index, row in enumerate(rows):
+        ws.write_row(index, 0, row)
+    wb.close()
     return buf.getvalue()
 
 
+@pytest.fixture(params=["calamine", "openpyxl"])
+def excel_backend(request, monkeypatch):
+    """Run an Excel test against each reader parse_contacts_excel can use."""
+    if request.param == "calamine":
+        pytest.importorskip("python_calamine")
+    else:
+        pytest.importorskip("openpyxl")
+        monkeypatch.setattr(contact_parser, "CalamineWorkbook", None)
+    return request.param
+
+
+@pytest.mark.usefixtures("excel_backend")
 def test_excel_with_header():
     data = _make_excel([("phone", "name"), ("+14155552671", "Alice"), ("+442071234567", "Bob")])
     contacts = parse_contacts_excel(data)
@@ -123,6 +199,7 @@ def test_excel_with_header():
     assert contacts[0].name == "Alice"
 
 
+@pytest.mark.usefixtures("excel_backend")
 def test_excel_phone_only_header():
     data = _make_excel([("phone",), ("+14155552671",)])
     contacts = parse_contacts_excel(data)
@@ -130,6 +207,7 @@ def test_excel_phone_only_header():
     assert contacts[0].name == ""
 
 
+@pytest.mark.usefixtures("excel_backend")
 def test_excel_no_header():
     data = _make_excel([("+14155552671", "Alice")])
     contacts = parse_contacts_excel(data)
@@ -137,19 +215,66 @@ def test_excel_no_header():
     assert contacts[0].phone == "+14155552671"
 
 
+@pytest.mark.usefixtures("excel_backend")
 def test_excel_skips_invalid():
     data = _make_excel([("phone",), ("not-a-phone",), ("+14155552671",)])
     contacts = parse_contacts_excel(data)
     assert len(contacts) == 1
 
 
+@pytest.mark.usefixtures("excel_backend")
 def test_excel_empty_raises():
-    wb = openpyxl.Workbook()
-    ws = wb.active
+    with pytest.raises(ContactParseError):
+        parse_contacts_excel(_make_excel([]))
+
+
+@pytest.mark.usefixtures("excel_backend")
+def test_excel_numeric_cells():
+    data = _make_excel([("phone", "name"), (14155552671, 42), ("+442071234567", None)])
+    contacts = parse_contacts_excel(data)
+    assert contacts == [
+        Contact(phone="+14155552671", name="42"),
+        Contact(phone="+442071234567", name=""),
+    ]
+
+
+@pytest.mark.usefixtures("excel_backend")
+def test_excel_reads_first_worksheet():
+    import xlsxwriter
+
     buf = io.BytesIO()
-    wb.save(buf)
+    wb = xlsxwriter.Workbook(buf, {"in_memory": True})
+    chart_sheet = wb.add_chartsheet("Chart")
+    first = wb.add_worksheet("First")
+    second = wb.add_worksheet("Second")
+    first.write_column(0, 0, ["phone", "+14155552671"])
+    second.write_column(0, 0, ["phone", "+442071234567"])
+    chart = wb.add_chart({"type": "line"})
+    chart.add_series({"values": "=First!$A$2:$A$2"})
+    chart_sheet.set_chart(chart)
+    # Both readers must ignore which tab was active when the file was saved
+    second.activate()
+    wb.close()
+
+    contacts = parse_contacts_excel(buf.getvalue())
+    assert [c.phone for c in contacts] == ["+14155552671"]
+
+
+def test_excel_workbook_closed_on_error(monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr(contact_parser, "CalamineWorkbook", None)
+    closed = []
+    load_workbook = openpyxl.load_workbook
+
+    def tracking_load_workbook(*args, **kwargs):
+        workbook = load_workbook(*args, **kwargs)
+        monkeypatch.setattr(workbook, "close", lambda: closed.append(True))
+        return workbook
+
+    monkeypatch.setattr(openpyxl, "load_workbook", tracking_load_workbook)
     with pytest.raises(ContactParseError):
-        parse_contacts_excel(buf.getvalue())
+        parse_contacts_excel(_make_excel([]))
+    assert closed == [True]
 
 
 # ---------------------------------------------------------------------------
@@ -168,6 +293,17 @@ def test_dispatch_xlsx():
     assert len(contacts) == 1
 
 
+@pytest.mark.usefixtures("excel_backend")
+def test_dispatch_bytearray_input():
+    csv_data = bytearray(b"phone\n+14155552671\n")
+    assert len(parse_contacts_file("contacts.csv", csv_data)) == 1
+    xlsx_data = bytearray(_make_excel([("phone",), ("+14155552671",)]))
+    assert len(parse_contacts_file("contacts.xlsx", xlsx_data)) == 1
+    # Parsing reads the buffers in place and releases them afterwards
+    csv_data.extend(b"+442071234567\n")
+    xlsx_data.clear()
+
+
 def test_dispatch_unsupported_format():
     with pytest.raises(ContactParseError, match="Unsupported file format"):
         parse_contacts_file("contacts.txt", b"some data")
@@ -2,10 +2,23 @@
 
 import asyncio
 import time
+from types import SimpleNamespace
 import pytest
 
+import rate_limiter
 from rate_limiter import RateLimiter
 
+# These tests assert on wall-clock delays; keep them on one xdist worker
+pytestmark = pytest.mark.xdist_group("rate_limiter")
+
+
+def _age_windows(limiter: RateLimiter, ns: int) -> None:
+    """Shift every recorded send ``ns`` nanoseconds into the past."""
+    for window in (limiter._second_window, limiter._minute_window):
+        aged = [slot - ns for slot in window]
+        window.clear()
+        window.extend(aged)
+
 
 @pytest.mark.asyncio
 async def test_acquire_within_limits():
@@ -60,8 +73,9 @@ async def test_multiple_coroutines_respect_limits():
         await limiter.acquire()
         results.append(time.monotonic())
 
-    tasks = [asyncio.create_task(acquire_and_record()) for _ in range(6)]
-    await asyncio.gather(*tasks)
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(6):
+            tg.create_task(acquire_and_record())
 
     # First 3 should be in the first second, next 3 in the second
     assert len(results) == 6
@@ -72,16 +86,61 @@ async def test_multiple_coroutines_respect_limits():
 
 @pytest.mark.asyncio
 async def test_clean_windows_removes_old_entries():
-    """After waiting, old timestamps should be purged from the window."""
+    """After waiting, old timestamps should drop out of the window."""
     limiter = RateLimiter(messages_per_second=2, messages_per_minute=100)
     await limiter.acquire()
     await limiter.acquire()
     assert limiter.current_second_count == 2
 
     # Manually age the timestamps
-    now = time.monotonic()
-    while limiter._second_window:
-        limiter._second_window.popleft()
-    limiter._second_window.append(now - 2)  # expired
+    _age_windows(limiter, 2_000_000_000)
 
     assert limiter.current_second_count == 0
+    assert limiter.current_minute_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sliding_windows_never_exceed_limits(monkeypatch):
+    """No 1 s or 60 s span may hold more sends than its limit, at any offset."""
+    clock = 0
+
+    async def fake_sleep(delay):
+        nonlocal clock
+        clock += round(delay * 1_000_000_000)
+
+    limiter = RateLimiter(messages_per_second=10, messages_per_minute=100)
+    # Swap the modules rate_limiter sees, not their attributes: the event loop
+    # is shared by the whole session and must keep the real clock and sleep
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic_ns=lambda: clock))
+    monkeypatch.setattr(rate_limiter, "asyncio", SimpleNamespace(sleep=fake_sleep))
+
+    sent = []
+    for _ in range(250):
+        await limiter.acquire()
+        sent.append(clock)
+
+    assert all(b - a >= 1_000_000_000 for a, b in zip(sent, sent[10:]))
+    assert all(b - a >= 60_000_000_000 for a, b in zip(sent, sent[100:]))
+    # ...while still sending as soon as the windows allow
+    assert sent[99] == 9_000_000_000
+    assert sent[100] == 60_000_000_000
+
+
+@pytest.mark.asyncio
+async def test_cancelled_acquire_does_not_consume():
+    """A waiter cancelled while sleeping should not count as a send."""
+    limiter = RateLimiter(messages_per_second=1, messages_per_minute=100)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.current_second_count == 1
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    # One second later only the first send should count against the window
+    _age_windows(limiter, 1_000_000_000)
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start < 0.1